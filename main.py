@@ -1,18 +1,47 @@
 from fastmcp import FastMCP
 import os
 import aiosqlite
+import orjson
 import tempfile
 import sqlite3
 import json
+import asyncio
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import Annotated, NotRequired, TypedDict
+from pydantic import Field
 
 # Use a writable temp directory for DB
 TEMP_DIR = tempfile.gettempdir()
 DB_PATH = os.path.join(TEMP_DIR, "expenses.db")
 CATEGORIES_PATH = os.path.join(os.path.dirname(__file__), "categories.json")
 
+# Fixed projections; rows are zipped with these instead of reading cur.description
+EXPENSE_COLS = ("id", "date", "amount", "category", "subcategory", "note")
+SUMMARY_COLS = ("category", "total_amount", "count")
+
+# Largest page list_expenses will return; SQLite treats a negative LIMIT as
+# "no limit", so the bounds are enforced on the tool's parameters
+LIST_MAX = 1000
+
+# Fixed SQL shared across tools, so every caller runs identical text and
+# reuses the same cached statement
+INSERT_SQL = "INSERT INTO expenses(date, amount, category, subcategory, note) VALUES (?,?,?,?,?)"
+LIST_SQL = """
+    SELECT id, date, amount, category, subcategory, note
+    FROM expenses
+    WHERE date BETWEEN ? AND ?
+    ORDER BY date DESC, id DESC
+    LIMIT ? OFFSET ?
+"""
+
 print(f"Database path: {DB_PATH}")
 
-mcp = FastMCP("My Expense Tracker v3.0")
+def orjson_serializer(data):
+    '''Encode tool results with orjson; row lists are the bulk of every response.'''
+    return orjson.dumps(data, default=str).decode()
+
+mcp = FastMCP("My Expense Tracker v3.0", tool_serializer=orjson_serializer)
 
 # -------------------------------
 # Initialize DB (sync, once)
@@ -31,9 +60,17 @@ def init_db():
                     note TEXT DEFAULT ''
                 )
             """)
-            # Test write access
-            c.execute("INSERT OR IGNORE INTO expenses(date, amount, category) VALUES ('2000-01-01', 0, 'test')")
-            c.execute("DELETE FROM expenses WHERE category = 'test'")
+            c.execute("CREATE INDEX IF NOT EXISTS idx_expenses_date_category ON expenses(date, category)")
+            # Covering index: summarize() is answered from the index without row lookups.
+            # It leads with category, so it also serves category-only filters and
+            # the older single-column category index is just extra write cost.
+            c.execute("CREATE INDEX IF NOT EXISTS idx_sum_cover ON expenses(category, date, amount)")
+            c.execute("DROP INDEX IF EXISTS idx_expenses_category")
+            # Check write access without writing (and fsyncing) a throwaway row
+            if not os.access(DB_PATH, os.W_OK):
+                raise PermissionError(f"Database is not writable: {DB_PATH}")
+            # Refresh planner statistics so the date/category indexes get used
+            c.execute("ANALYZE")
             print("Database initialized successfully with write access")
     except Exception as e:
         print(f"Database initialization error: {e}")
@@ -41,20 +78,234 @@ def init_db():
 
 init_db()
 
+# -------------------------------
+# Connection pool
+# -------------------------------
+# A fixed set of long-lived connections, opened lazily on first use. Each keeps
+# its own sqlite3 statement cache warm, and the PRAGMAs below are applied once
+# per physical connection instead of on every tool call.
+POOL_SIZE = 8
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA wal_autocheckpoint=1000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+)
+
+# How often (seconds) the planner statistics are refreshed with PRAGMA optimize
+OPTIMIZE_INTERVAL = 3600
+
+_pool = None
+_pool_lock = asyncio.Lock()
+_optimize_task = None
+
+async def _open_conn():
+    c = await aiosqlite.connect(DB_PATH, cached_statements=256)
+    try:
+        for pragma in PRAGMAS:
+            await c.execute(pragma)
+    except BaseException:
+        await c.close()
+        raise
+    return c
+
+async def _get_pool():
+    global _pool, _optimize_task
+    if _pool is None:
+        async with _pool_lock:
+            if _pool is None:
+                pool = asyncio.Queue(maxsize=POOL_SIZE)
+                try:
+                    for _ in range(POOL_SIZE):
+                        pool.put_nowait(await _open_conn())
+                except BaseException:
+                    # Each open connection has a non-daemon thread; don't strand them
+                    await _close_conns(pool, optimize=False)
+                    raise
+                _pool = pool
+                _optimize_task = asyncio.create_task(_periodic_optimize())
+    return _pool
+
+async def _periodic_optimize():
+    while True:
+        await asyncio.sleep(OPTIMIZE_INTERVAL)
+        try:
+            async with connection() as c:
+                await c.execute("PRAGMA optimize")
+        except Exception as e:
+            print(f"PRAGMA optimize failed: {e}")
+
+async def close_pool():
+    '''Stop the writer, then optimize and close the pooled connections.'''
+    global _pool, _optimize_task
+    if _optimize_task is not None and not _optimize_task.done():
+        _optimize_task.cancel()
+    _optimize_task = None
+    await _stop_writer()
+    pool, _pool = _pool, None
+    if pool is not None:
+        await _close_conns(pool, optimize=True)
+
+async def _close_conns(pool, optimize):
+    '''Close every connection in pool, even if optimizing or closing one fails.'''
+    while not pool.empty():
+        c = pool.get_nowait()
+        try:
+            if optimize:
+                await c.execute("PRAGMA optimize")
+        except Exception as e:
+            print(f"PRAGMA optimize failed: {e}")
+        finally:
+            try:
+                await c.close()
+            except Exception as e:
+                print(f"Closing connection failed: {e}")
+
+@asynccontextmanager
+async def connection():
+    '''Borrow a pooled connection for the duration of the block.'''
+    pool = await _get_pool()
+    c = await pool.get()
+    try:
+        yield c
+    except BaseException:
+        # Includes cancellation: never hand a connection back mid-transaction.
+        # The rollback is queued on the connection's own thread, so it runs
+        # before anything the next borrower sends.
+        await c.rollback()
+        raise
+    finally:
+        pool.put_nowait(c)
+
+# -------------------------------
+# Group commit
+# -------------------------------
+# Single-row writes are queued to one writer task with its own connection. It
+# runs everything pending (up to GROUP_COMMIT_MAX statements) in one
+# BEGIN IMMEDIATE ... COMMIT, so concurrent writers share a single fsync.
+# Writes arriving while a batch commits are picked up by the next batch.
+GROUP_COMMIT_MAX = 64
+
+_write_queue = None
+_writer_task = None
+
+def _commit_batch(conn, batch):
+    '''Run (sql, params) pairs in one transaction; return a result or error per pair.'''
+    results = []
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        for sql, params in batch:
+            try:
+                cur = conn.execute(sql, params)
+                results.append((cur.lastrowid, cur.rowcount))
+            except (sqlite3.Error, OverflowError, ValueError, TypeError) as e:
+                # A failed statement is undone on its own; only give up on the
+                # batch if SQLite had to abort the whole transaction.
+                if not conn.in_transaction:
+                    raise
+                results.append(e)
+        conn.execute("COMMIT")
+    except BaseException:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+    return results
+
+def _open_writer_conn():
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False, isolation_level=None, cached_statements=256)
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+def _settle(batch, commit):
+    '''Resolve each caller's future from a finished _commit_batch call.'''
+    try:
+        results = commit.result()
+    except Exception as e:
+        results = [e] * len(batch)
+    for (_, _, fut), result in zip(batch, results):
+        if fut.done():
+            continue
+        if isinstance(result, Exception):
+            fut.set_exception(result)
+        else:
+            fut.set_result(result)
+
+async def _writer(queue):
+    conn = None
+    batch = []
+    commit = None
+    stop_error = RuntimeError("Group-commit writer stopped")
+    try:
+        conn = await asyncio.to_thread(_open_writer_conn)
+        loop = asyncio.get_running_loop()
+        running = True
+        while running:
+            batch = [await queue.get()]
+            while len(batch) < GROUP_COMMIT_MAX and not queue.empty():
+                batch.append(queue.get_nowait())
+            if None in batch:
+                running = False
+                batch = [item for item in batch if item is not None]
+            if not batch:
+                continue
+            # A plain executor future rather than a task, so shutdown's
+            # cancel-all-tasks can't detach it from the thread still using conn
+            commit = loop.run_in_executor(None, _commit_batch, conn, [(sql, params) for sql, params, _ in batch])
+            await asyncio.shield(commit)
+            _settle(batch, commit)
+            batch, commit = [], None
+    except Exception as e:
+        # The next _write() starts a fresh writer
+        print(f"Group-commit writer stopped: {e}")
+        stop_error = RuntimeError(f"Group-commit writer stopped: {e}")
+    finally:
+        if commit is not None:
+            # Cancelled mid-batch: the worker thread still owns conn. Let it
+            # finish before closing, and report what the batch actually did.
+            await asyncio.wait([commit])
+            _settle(batch, commit)
+        # Nobody will read this queue again; fail anything still waiting so
+        # callers don't hang.
+        pending = batch + [queue.get_nowait() for _ in range(queue.qsize())]
+        for item in pending:
+            if item is not None and not item[2].done():
+                item[2].set_exception(stop_error)
+        if conn is not None:
+            conn.close()
+
+async def _stop_writer():
+    global _write_queue, _writer_task
+    if _writer_task is not None and not _writer_task.done():
+        _write_queue.put_nowait(None)
+        await _writer_task
+    _write_queue, _writer_task = None, None
+
+async def _write(sql, params):
+    '''Queue one write for the group-commit writer; return (lastrowid, rowcount) once committed.'''
+    global _write_queue, _writer_task
+    # (Re)start the writer if it was never started or has died
+    if _writer_task is None or _writer_task.done():
+        _write_queue = asyncio.Queue()
+        _writer_task = asyncio.create_task(_writer(_write_queue))
+    fut = asyncio.get_running_loop().create_future()
+    _write_queue.put_nowait((sql, params, fut))
+    return await fut
+
 # -------------------------------
 # Add Expense
 # -------------------------------
+async def _insert(date, amount, category, subcategory, note):
+    expense_id, _ = await _write(INSERT_SQL, (date, amount, category, subcategory, note))
+    return expense_id
+
 @mcp.tool()
-async def add_expense(date, amount, category, subcategory="", note=""):
+async def add_expense(date: str, amount: float, category: str, subcategory: str = "", note: str = ""):
     '''Add a new expense entry.'''
     try:
-        async with aiosqlite.connect(DB_PATH) as c:
-            cur = await c.execute(
-                "INSERT INTO expenses(date, amount, category, subcategory, note) VALUES (?,?,?,?,?)",
-                (date, amount, category, subcategory, note)
-            )
-            await c.commit()
-            return {"status": "ok", "id": cur.lastrowid}
+        expense_id = await _insert(date, amount, category, subcategory, note)
+        return {"status": "ok", "id": expense_id}
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
@@ -62,17 +313,40 @@ async def add_expense(date, amount, category, subcategory="", note=""):
 # Credit Expense
 # -------------------------------
 @mcp.tool()
-async def credit_expense(date, amount, category, subcategory="", note=""):
+async def credit_expense(date: str, amount: float, category: str, subcategory: str = "", note: str = ""):
     '''Record a credit (negative expense).'''
     credit_amount = -abs(amount)
     try:
-        async with aiosqlite.connect(DB_PATH) as c:
-            cur = await c.execute(
-                "INSERT INTO expenses(date, amount, category, subcategory, note) VALUES (?,?,?,?,?)",
-                (date, credit_amount, category, subcategory, note)
+        expense_id = await _insert(date, credit_amount, category, subcategory, note)
+        return {"status": "ok", "id": expense_id, "credited": credit_amount}
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+
+# -------------------------------
+# Add Expenses (bulk)
+# -------------------------------
+class ExpenseRow(TypedDict):
+    '''One row for add_expenses_bulk; same fields and types as add_expense.'''
+    date: str
+    amount: float
+    category: str
+    subcategory: NotRequired[str]
+    note: NotRequired[str]
+
+@mcp.tool()
+async def add_expenses_bulk(rows: list[ExpenseRow]):
+    '''Add many expense entries in a single transaction.'''
+    try:
+        async with connection() as c:
+            # Take the write lock up front so the batch commits with one fsync
+            await c.execute("BEGIN IMMEDIATE")
+            cur = await c.executemany(
+                INSERT_SQL,
+                ((r["date"], r["amount"], r["category"], r.get("subcategory", ""), r.get("note", ""))
+                 for r in rows)
             )
             await c.commit()
-            return {"status": "ok", "id": cur.lastrowid, "credited": credit_amount}
+            return {"status": "ok", "inserted": cur.rowcount}
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
@@ -80,22 +354,18 @@ async def credit_expense(date, amount, category, subcategory="", note=""):
 # List Expenses
 # -------------------------------
 @mcp.tool()
-async def list_expenses(start_date, end_date):
-    '''List expenses in a date range.'''
+async def list_expenses(start_date: str, end_date: str,
+                        limit: Annotated[int, Field(ge=1, le=LIST_MAX)] = LIST_MAX,
+                        offset: Annotated[int, Field(ge=0)] = 0):
+    '''List expenses in a date range, one page of at most `limit` rows at a time.'''
     try:
-        async with aiosqlite.connect(DB_PATH) as c:
+        async with connection() as c:
             cur = await c.execute(
-                """
-                SELECT id, date, amount, category, subcategory, note
-                FROM expenses
-                WHERE date BETWEEN ? AND ?
-                ORDER BY date DESC, id DESC
-                """,
-                (start_date, end_date)
+                LIST_SQL,
+                (start_date, end_date, limit, offset)
             )
-            cols = [d[0] for d in cur.description]
             rows = await cur.fetchall()
-            return [dict(zip(cols, r)) for r in rows]
+            return [dict(zip(EXPENSE_COLS, r)) for r in rows]
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
@@ -103,10 +373,14 @@ async def list_expenses(start_date, end_date):
 # Summarize Expenses
 # -------------------------------
 @mcp.tool()
-async def summarize(start_date, end_date, category=None):
-    '''Summarize expenses by category.'''
+async def summarize(start_date: str, end_date: str, category: str | None = None):
+    '''Summarize expenses by category.
+
+    Returns parallel columns rather than one object per category:
+    {"category": [...], "total_amount": [...], "count": [...]}.
+    '''
     try:
-        async with aiosqlite.connect(DB_PATH) as c:
+        async with connection() as c:
             query = """
                 SELECT category,
                        SUM(amount) AS total_amount,
@@ -123,53 +397,93 @@ async def summarize(start_date, end_date, category=None):
             query += " GROUP BY category ORDER BY total_amount DESC"
 
             cur = await c.execute(query, params)
-            cols = [d[0] for d in cur.description]
             rows = await cur.fetchall()
-            return [dict(zip(cols, r)) for r in rows]
+            columns = zip(*rows) if rows else ((),) * len(SUMMARY_COLS)
+            return dict(zip(SUMMARY_COLS, map(list, columns)))
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
+# -------------------------------
+# Row filter shared by delete/update
+# -------------------------------
+# Only the filters that are set go into the WHERE clause, so SQLite can seek on
+# the rowid or an index. There are only a few filter shapes, and each one is
+# built once here and then reused as a cached statement.
+FILTER_CLAUSES = (
+    ("id", "id = :id"),
+    ("date", "date = :date"),
+    ("start_date", "date >= :start_date"),
+    ("end_date", "date <= :end_date"),
+    ("category", "category = :category"),
+    ("subcategory", "subcategory = :subcategory"),
+)
+
+@lru_cache(maxsize=None)
+def _filtered_sql(prefix, active, suffix):
+    where = " AND ".join(clause for name, clause in FILTER_CLAUSES if name in active)
+    return f"{prefix} WHERE {where} {suffix}".rstrip()
+
+def filtered_sql(prefix, params, suffix=""):
+    '''Return `prefix WHERE ... suffix` using only the filters set in params.'''
+    return _filtered_sql(prefix, frozenset(k for k, v in params.items() if v is not None), suffix)
+
+DELETE_SQL = "DELETE FROM expenses"
+
+# Only columns given a new value go into the SET list, so an update that
+# doesn't touch date/category/amount leaves their index entries alone. Each
+# SET shape is built once, like the WHERE shapes above.
+UPDATE_COLS = ("date", "amount", "category", "subcategory", "note")
+
+@lru_cache(maxsize=None)
+def _update_sql(active):
+    sets = ", ".join(f"{col} = :new_{col}" for col in UPDATE_COLS if f"new_{col}" in active)
+    return f"UPDATE expenses SET {sets}"
+
+def update_sql(new_values):
+    '''Return `UPDATE expenses SET ...` for only the new values that are set.'''
+    return _update_sql(frozenset(k for k, v in new_values.items() if v is not None))
+
+# Dry runs report how many rows match but only return a bounded sample of them
+DRY_RUN_SAMPLE = 100
+PREVIEW_COUNT_SQL = "SELECT COUNT(*) FROM expenses"
+PREVIEW_SQL = "SELECT " + ", ".join(EXPENSE_COLS) + " FROM expenses"
+PREVIEW_LIMIT = f"LIMIT {DRY_RUN_SAMPLE}"
+
+async def _preview(c, params):
+    cur = await c.execute(filtered_sql(PREVIEW_COUNT_SQL, params), params)
+    (matched,) = await cur.fetchone()
+    cur = await c.execute(filtered_sql(PREVIEW_SQL, params, PREVIEW_LIMIT), params)
+    rows = await cur.fetchall()
+    return {"status": "dry_run", "matched": matched, "sample": [dict(zip(EXPENSE_COLS, r)) for r in rows]}
+
 # -------------------------------
 # Delete Expenses
 # -------------------------------
 @mcp.tool()
-async def delete_expenses(expense_id=None, date=None, start_date=None, end_date=None,
-                          category=None, subcategory=None, dry_run=False):
+async def delete_expenses(expense_id: int | None = None, date: str | None = None,
+                          start_date: str | None = None, end_date: str | None = None,
+                          category: str | None = None, subcategory: str | None = None,
+                          dry_run: bool = False):
     '''Delete expenses with filters.'''
-    query = "DELETE FROM expenses WHERE 1=1"
-    params = []
-
-    if expense_id is not None:
-        query += " AND id = ?"
-        params.append(expense_id)
-    if date is not None:
-        query += " AND date = ?"
-        params.append(date)
-    if start_date and end_date:
-        query += " AND date BETWEEN ? AND ?"
-        params.extend([start_date, end_date])
-    if category is not None:
-        query += " AND category = ?"
-        params.append(category)
-    if subcategory is not None:
-        query += " AND subcategory = ?"
-        params.append(subcategory)
-
-    if not params:
+    has_range = bool(start_date and end_date)
+    params = {
+        "id": expense_id,
+        "date": date,
+        "start_date": start_date if has_range else None,
+        "end_date": end_date if has_range else None,
+        "category": category,
+        "subcategory": subcategory,
+    }
+
+    if all(v is None for v in params.values()):
         return {"status": "error", "message": "No filters provided. Refusing to delete all records."}
 
     try:
-        async with aiosqlite.connect(DB_PATH) as c:
-            if dry_run:
-                preview_query = "SELECT * FROM expenses WHERE 1=1" + query.split("WHERE 1=1", 1)[1]
-                cur = await c.execute(preview_query, params)
-                cols = [d[0] for d in cur.description]
-                rows = await cur.fetchall()
-                return {"status": "dry_run", "rows": [dict(zip(cols, r)) for r in rows]}
-            else:
-                cur = await c.execute(query, params)
-                await c.commit()
-                return {"status": "ok", "deleted": cur.rowcount}
+        if dry_run:
+            async with connection() as c:
+                return await _preview(c, params)
+        _, deleted = await _write(filtered_sql(DELETE_SQL, params), params)
+        return {"status": "ok", "deleted": deleted}
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
@@ -178,113 +492,119 @@ async def delete_expenses(expense_id=None, date=None, start_date=None, end_date=
 # -------------------------------
 @mcp.tool()
 async def update_expenses(
-    expense_id=None,
-    start_date=None,
-    end_date=None,
-    filter_date=None,
-    filter_category=None,
-    filter_subcategory=None,
-    new_date=None,
-    new_amount=None,
-    new_category=None,
-    new_subcategory=None,
-    new_note=None,
-    dry_run=False
+    expense_id: int | None = None,
+    start_date: str | None = None,
+    end_date: str | None = None,
+    filter_date: str | None = None,
+    filter_category: str | None = None,
+    filter_subcategory: str | None = None,
+    new_date: str | None = None,
+    new_amount: float | None = None,
+    new_category: str | None = None,
+    new_subcategory: str | None = None,
+    new_note: str | None = None,
+    dry_run: bool = False
 ):
     '''Update expenses with optional dry-run.'''
-    set_clauses, set_params = [], []
-
-    if new_date is not None:
-        set_clauses.append("date = ?")
-        set_params.append(new_date)
-    if new_amount is not None:
-        set_clauses.append("amount = ?")
-        set_params.append(new_amount)
-    if new_category is not None:
-        set_clauses.append("category = ?")
-        set_params.append(new_category)
-    if new_subcategory is not None:
-        set_clauses.append("subcategory = ?")
-        set_params.append(new_subcategory)
-    if new_note is not None:
-        set_clauses.append("note = ?")
-        set_params.append(new_note)
-
-    if not set_clauses:
+    new_values = {
+        "new_date": new_date,
+        "new_amount": new_amount,
+        "new_category": new_category,
+        "new_subcategory": new_subcategory,
+        "new_note": new_note,
+    }
+
+    if all(v is None for v in new_values.values()):
         return {"status": "error", "message": "No new values provided."}
 
-    query = "UPDATE expenses SET " + ", ".join(set_clauses) + " WHERE 1=1"
-    where_params = []
-
-    if expense_id is not None:
-        query += " AND id = ?"
-        where_params.append(expense_id)
-    if filter_date is not None:
-        query += " AND date = ?"
-        where_params.append(filter_date)
-    if start_date and end_date:
-        query += " AND date BETWEEN ? AND ?"
-        where_params.extend([start_date, end_date])
-    if filter_category is not None:
-        query += " AND category = ?"
-        where_params.append(filter_category)
-    if filter_subcategory is not None:
-        query += " AND subcategory = ?"
-        where_params.append(filter_subcategory)
-
-    if not where_params:
+    has_range = bool(start_date and end_date)
+    params = {
+        "id": expense_id,
+        "date": filter_date,
+        "start_date": start_date if has_range else None,
+        "end_date": end_date if has_range else None,
+        "category": filter_category,
+        "subcategory": filter_subcategory,
+    }
+
+    if all(v is None for v in params.values()):
         return {"status": "error", "message": "No filters provided. Refusing to update all records."}
 
     try:
-        async with aiosqlite.connect(DB_PATH) as c:
-            if dry_run:
-                preview_query = "SELECT * FROM expenses WHERE 1=1" + query.split("WHERE 1=1", 1)[1]
-                cur = await c.execute(preview_query, where_params)
-                cols = [d[0] for d in cur.description]
-                rows = await cur.fetchall()
-                return {"status": "dry_run", "rows": [dict(zip(cols, r)) for r in rows]}
-            else:
-                cur = await c.execute(query, set_params + where_params)
-                await c.commit()
-                return {"status": "ok", "updated": cur.rowcount}
+        if dry_run:
+            async with connection() as c:
+                return await _preview(c, params)
+        _, updated = await _write(filtered_sql(update_sql(new_values), params), params | new_values)
+        return {"status": "ok", "updated": updated}
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
+# -------------------------------
+# Flush
+# -------------------------------
+@mcp.tool()
+async def flush():
+    '''Checkpoint the write-ahead log into the main database file; busy=1 means it was incomplete.'''
+    try:
+        async with connection() as c:
+            cur = await c.execute("PRAGMA wal_checkpoint(PASSIVE)")
+            busy, wal_frames, checkpointed = await cur.fetchone()
+            # busy=1 means readers/writers blocked part of the checkpoint
+            return {"status": "ok", "busy": busy, "wal_frames": wal_frames, "checkpointed": checkpointed}
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
 
 # -------------------------------
 # Categories Resource
 # -------------------------------
+DEFAULT_CATEGORIES = {
+    "categories": [
+        "Food & Dining",
+        "Transportation",
+        "Shopping",
+        "Entertainment",
+        "Bills & Utilities",
+        "Healthcare",
+        "Travel",
+        "Education",
+        "Business",
+        "Other"
+    ]
+}
+
+# Cached file contents keyed by mtime; mtime None means the defaults are cached
+_CAT_CACHE = {"mtime": None, "data": None}
+
 @mcp.resource("expense:///categories", mime_type="application/json")
 def categories():
     '''Return categories from file or defaults if missing.'''
     try:
-        default_categories = {
-            "categories": [
-                "Food & Dining",
-                "Transportation",
-                "Shopping",
-                "Entertainment",
-                "Bills & Utilities",
-                "Healthcare",
-                "Travel",
-                "Education",
-                "Business",
-                "Other"
-            ]
-        }
         try:
-            with open(CATEGORIES_PATH, "r", encoding="utf-8") as f:
-                return f.read()
+            mtime = os.stat(CATEGORIES_PATH).st_mtime_ns
         except FileNotFoundError:
-            return json.dumps(default_categories, indent=2)
+            mtime = None
+        if _CAT_CACHE["data"] is None or mtime != _CAT_CACHE["mtime"]:
+            if mtime is None:
+                data = json.dumps(DEFAULT_CATEGORIES, indent=2)
+            else:
+                with open(CATEGORIES_PATH, "r", encoding="utf-8") as f:
+                    data = f.read()
+            _CAT_CACHE["mtime"], _CAT_CACHE["data"] = mtime, data
+        return _CAT_CACHE["data"]
     except Exception as e:
         return json.dumps({"error": f"Could not load categories: {str(e)}"})
 
+# Legacy v2 URI (backup.py served it), backed by the same cached function
+mcp.resource("expense://categories", mime_type="application/json")(categories.fn)
+
 # -------------------------------
 # Run MCP Server
 # -------------------------------
 if __name__ == "__main__":
     # Run as HTTP server (accessible on port 8000)
-    mcp.run(transport="http", host="0.0.0.0", port=8000)
+    try:
+        mcp.run(transport="http", host="0.0.0.0", port=8000)
+    finally:
+        asyncio.run(close_pool())
     # Or fallback to default transport:
     # mcp.run()
\ No newline at end of file